@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
+import json
 import warnings
-from typing import List, Optional, Sequence, TypeVar
+import numpy as np
+from typing import List, Optional, Sequence, Tuple, TypeVar
 
 PandasDataFrame = TypeVar('pandas.core.frame.DataFrame')  # type hint for pandas DataFrame
 Ndarray = TypeVar('ndarray')  # type hint for numpy ndarray
@@ -22,31 +24,86 @@ class Variation:
         :param group: size of group in data (for Wald tests) 
         """
 
-        self.total = None  # type: Optional[int]
-        self.success = None  # type: Optional[int]
-        self.data = None  # type: List[int]
+        self.data = None  # type: Optional[Ndarray]
         self.group = group  # type: Optional[int]
 
         if data is not None:
             try:
-                self.data = list(data)
-            except:
-                raise TypeError('data must be convertible to list')
+                data = np.asarray(data)
+            except (TypeError, ValueError):
+                raise TypeError('data must be convertible to array')
+            if data.ndim != 1:
+                raise TypeError('data must be one-dimensional')
+            if data.size:
+                if data.dtype.kind == 'f':
+                    if not np.all((data == 0) | (data == 1)):
+                        raise Exception('data should contain only 0\'s and 1\'s.')
+                elif data.dtype.kind not in 'biu':
+                    raise TypeError('data must contain numeric or boolean values')
+                elif (data.dtype.kind == 'i' and data.min() < 0) or (np.bitwise_or.reduce(data) > 1):
+                    raise Exception('data should contain only 0\'s and 1\'s.')
+            self.data = np.ascontiguousarray(data, dtype=np.uint8)
+            self._set_counts(self.data.size, int(self.data.sum()))
         else:
-            self.data = data
+            self._set_counts(total, success)
 
-        if data is not None:
-            self.total = len(data)
-            self.success = sum(data)
-        else:
-            self.total = total if total else 0.
-            self.success = success if success else 0.
+    def _set_counts(self, total: Optional[int], success: Optional[int]) -> None:
+        """
+        Validate and set total and success numbers. Missing numbers are treated as zeros.
+        
+        :param total: number of total visitors
+        :param success: number of visitors who clicked the button
+        """
+        total = total if total else 0.
+        success = success if success else 0.
+        if total < success:
+            raise Exception('Conversion rate > 1')
+        self._total = total  # type: int
+        self._success = success  # type: int
+        self._update_conversion()
 
-        if (self.data is not None) and (set(self.data) != {0, 1}):
-            raise Exception('data should contain only 0\'s and 1\'s.')
+    def _update_conversion(self) -> None:
+        """
+        Refresh the cached conversion estimate.
+        """
+        self._conversion = self._success / self._total if self._total else float('nan')  # type: float
 
-        if (self.total is not None) and (self.success is not None) and (self.total < self.success):
-            raise Exception('Conversion rate > 1')
+    @property
+    def total(self) -> int:
+        """
+        Number of total visitors
+        """
+        return self._total
+
+    @total.setter
+    def total(self, value: int) -> None:
+        self._total = value
+        self._update_conversion()
+
+    @property
+    def success(self) -> int:
+        """
+        Number of visitors who clicked the button
+        """
+        return self._success
+
+    @success.setter
+    def success(self, value: int) -> None:
+        self._success = value
+        self._update_conversion()
+
+    @classmethod
+    def from_counts(cls, total: Optional[int]=None, success: Optional[int]=None,
+                    group: Optional[int]=None) -> 'Variation':
+        """
+        Create Variation instance from total and success numbers only, without per-visitor data.
+        
+        :param total: number of total visitors
+        :param success: number of visitors who clicked the button
+        :param group: size of group in data (for Wald tests)
+        :return: variation
+        """
+        return cls(total, success, group=group)
 
     def estimate_conversion(self) -> float:
         """
@@ -54,16 +111,15 @@ class Variation:
         
         :return: conversion 
         """
-        try:
-            return self.success / self.total
-        except:
-            raise ZeroDivisionError()
+        return self._conversion
 
     def copy(self) -> 'Variation':
         """
         Copy Variation instance
         """
-        return Variation(self.total, self.success, self.data)
+        if self.data is None:
+            return Variation.from_counts(self.total, self.success)
+        return Variation(data=self.data.copy())
 
     def truncate(self, size: int) -> 'Variation':
         """
@@ -72,21 +128,35 @@ class Variation:
         :param size: new size
         :return: variation
         """
-        if not self.data:
+        if self.data is None or not self.data.size:
             raise Exception('Variation has no data inside')
         else:
             return Variation(data=self.data[:1 + min(size, self.total)])
 
-    def generate_sample(self) -> Ndarray:
+    def generate_sample(self, rng: Optional[np.random.Generator] = None) -> Ndarray:
         """
         Generate a sample based on total number and number of successes.
+        
+        :param rng: random generator. By default a new one is created.
+        :return: sample
         """
-        import numpy as np
-        mask = np.random.choice(self.total, self.success, replace=False)
-        sample = np.zeros(self.total)
-        sample[mask] = 1
+        if self.data is not None:
+            return self.data.copy()
+        if rng is None:
+            rng = np.random.default_rng()
+        sample = np.zeros(int(self.total), dtype=np.uint8)
+        sample[:int(self.success)] = 1
+        rng.shuffle(sample)
         return sample
 
+    def generate_sample_counts(self) -> Tuple[int, int]:
+        """
+        Return aggregate statistics of a sample without generating it.
+        
+        :return: number of successes and total number
+        """
+        return self.success, self.total
+
 
 class VariationsCollection:
     """
@@ -100,7 +170,7 @@ class VariationsCollection:
         If no arguments are provided the empty instance would be created.
         """
         self.control = None  # type: Optional[Variation]
-        self.treatments = list()  # type: Optional[List[Variation]]
+        self.treatments = list()  # type: List[Variation]
 
         if len(args):
             self.add_control(args[0])
@@ -131,10 +201,9 @@ class VariationsCollection:
         if not len(args):
             warnings.warn('Nothing to add')
         else:
-            for arg in args:
-                if not isinstance(arg, Variation):
-                    raise TypeError('Objects of Variation type only suit.')
-            self.treatments += list(args)
+            if not all(isinstance(arg, Variation) for arg in args):
+                raise TypeError('Objects of Variation type only suit.')
+            self.treatments.extend(args)
 
     def delete_control(self) -> None:
         """
@@ -163,33 +232,24 @@ class VariationsCollection:
         if (self.control is None) and (not len(self.treatments)):
             warnings.warn('The collection is empty.')
             return None
-        info_dict = dict()
-        if self.control is not None:
-            info_dict['Control'] = [self.control.success,
-                                    self.control.total,
-                                    self.control.estimate_conversion()
-                                    ]
-        for i, treatment in enumerate(self.treatments, 1):
-            info_dict['Treatment_{:d}'.format(i)] = [treatment.success,
-                                                     treatment.total,
-                                                     treatment.estimate_conversion()
-                                                     ]
-        info_df = pd.DataFrame(info_dict)
-        info_df.index = ['Success', 'Total', 'Conversion_rate']
-        return info_df.T
+        variations = ([self.control] if self.control is not None else []) + self.treatments
+        index = ['Control'] if self.control is not None else []
+        index += [f'Treatment_{i}' for i, _ in enumerate(self.treatments, 1)]
+        info = np.empty((len(variations), 3), dtype=np.float64)
+        for row, variation in zip(info, variations):
+            row[:] = variation.success, variation.total, variation.estimate_conversion()
+        return pd.DataFrame(info, index=index, columns=['Success', 'Total', 'Conversion_rate'])
 
     def dump_json(self) -> str:
         """
         Dumps collection to json
         """
-        import json
-
         def variation_to_dict(var: Variation) -> dict:
             """Dumps var to dictionary"""
             dump = dict()
             dump['total'] = var.total if var is not None else None
             dump['success'] = var.success if var is not None else None
-            dump['data'] = var.data if var is not None else None
+            dump['data'] = var.data.tolist() if (var is not None) and (var.data is not None) else None
             dump['group'] = var.group if var is not None else None
             return dump
 
@@ -205,8 +265,6 @@ class VariationsCollection:
         Loads data from json
         :param js: json with collection data
         """
-        import json
-
         d = json.loads(js)  # type: dict
 
         def dict_to_variation(dictionary: dict) -> Variation:
@@ -214,7 +272,7 @@ class VariationsCollection:
             if dictionary['data'] is not None:
                 return Variation(data=dictionary['data'], group=dictionary['group'])
             else:
-                return Variation(total=dictionary['total'], success=dictionary['success'], group=dictionary['group'])
+                return Variation.from_counts(dictionary['total'], dictionary['success'], dictionary['group'])
 
         try:
             self.delete_control()
@@ -1,6 +1,13 @@
 # -*- coding: utf-8 -*-
-from ABTypes import Variation
-from typing import Tuple
+from ABTypes import Variation, Ndarray
+from _core import (NUMBA_AVAILABLE, _z_superiority_core, _z_binom_core, _z_superiority_batch, _z_binom_batch,
+                   _fisher_core, _fisher_scalar_core)
+import numpy as np
+from typing import Optional, Tuple
+from scipy.special import ndtr, betaln
+from scipy.stats import beta
+from scipy.integrate import dblquad
+import math
 
 TestResult = Tuple[float, float]  # type hint for tests output
 
@@ -22,19 +29,7 @@ def z_binomial_superiority_test(v1: Variation, v2: Variation, delta: float = 0.)
     :param delta: superiority margin
     :return: test statistic and p-value
     """
-    from scipy.stats import norm
-    from numpy import sqrt
-
-    p1_hat = v1.estimate_conversion()
-    p2_hat = v2.estimate_conversion()
-    n1 = v1.total
-    n2 = v2.total
-    pe = p1_hat - p2_hat - delta  # point estimation
-    var = p1_hat * (1 - p1_hat) / n1 + p2_hat * (1 - p2_hat) / n2  # variance estimation
-    z = pe / sqrt(var)  # test statistic
-    p_value = norm.sf(z)  # p-value
-
-    return z, p_value
+    return _z_superiority_core(float(v1.success), float(v1.total), float(v2.success), float(v2.total), float(delta))
 
 
 def z_binomial_test(v1: Variation, v2: Variation) -> TestResult:
@@ -53,22 +48,7 @@ def z_binomial_test(v1: Variation, v2: Variation) -> TestResult:
     :param v2: second variation
     :return: test statistic and p-value
     """
-    from scipy.stats import norm
-    from numpy import sqrt
-
-    m1 = v1.success
-    m2 = v2.success
-    n1 = v1.total
-    n2 = v2.total
-    pe = m1 / n1 - m2 / n2 + 0.5 * (1 / n1 - 1 / n2)  # point estimation
-    var = ((m1 + m2) / (n1 + n2) *
-           (n1 + n2 - m1 - m2) / (n1 + n2) *
-           (1 / n1 + 1 / n2)
-           )  # variance estimation
-    z = pe / sqrt(var)  # test statistic
-    p_value = norm.sf(z)  # p-value
-
-    return z, p_value
+    return _z_binom_core(float(v1.success), float(v1.total), float(v2.success), float(v2.total))
 
 
 def f_binomial_test(v1: Variation, v2: Variation) -> TestResult:
@@ -86,13 +66,103 @@ def f_binomial_test(v1: Variation, v2: Variation) -> TestResult:
     :param v2: second variation
     :return: test statistic and p-value
     """
-    from numpy import array
-    from scipy.stats import fisher_exact
+    return _fisher_scalar_core(v1.success, v1.total, v2.success, v2.total)
 
-    table = array([[v1.success, v2.success],
-                   [v1.total - v1.success, v2.total - v2.success]
-                   ])  # 2x2 contingency table
-    return fisher_exact(table, 'greater')
+
+def z_binomial_superiority_test_vec(m1: Ndarray, n1: Ndarray, m2: Ndarray, n2: Ndarray,
+                                    delta: float = 0.) -> Tuple[Ndarray, Ndarray]:
+    """
+    Vectorized version of z_binomial_superiority_test.
+    Performs a batch of tests at once on arrays of successes and totals (NumPy broadcasting rules apply).
+    Returns arrays of test statistics and p-values.
+    
+    :param m1: successes of the first variations
+    :param n1: totals of the first variations
+    :param m2: successes of the second variations
+    :param n2: totals of the second variations
+    :param delta: superiority margin
+    :return: test statistics and p-values
+    """
+    m1, n1, m2, n2 = (np.asarray(x, dtype=np.float64) for x in (m1, n1, m2, n2))
+    if NUMBA_AVAILABLE:
+        m1, n1, m2, n2 = np.broadcast_arrays(m1, n1, m2, n2)
+        z, p_value = _z_superiority_batch(m1.ravel(), n1.ravel(), m2.ravel(), n2.ravel(), float(delta))
+        return z.reshape(m1.shape), p_value.reshape(m1.shape)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p1_hat = m1 / n1
+        p2_hat = m2 / n2
+        pe = p1_hat - p2_hat - delta  # point estimation
+        var = p1_hat * (1 - p1_hat) / n1 + p2_hat * (1 - p2_hat) / n2  # variance estimation
+        z = pe / np.sqrt(var)  # test statistic
+    p_value = ndtr(-z)  # p-value
+
+    return z, p_value
+
+
+def z_binomial_test_vec(m1: Ndarray, n1: Ndarray, m2: Ndarray, n2: Ndarray) -> Tuple[Ndarray, Ndarray]:
+    """
+    Vectorized version of z_binomial_test.
+    Performs a batch of tests at once on arrays of successes and totals (NumPy broadcasting rules apply).
+    Returns arrays of test statistics and p-values.
+    
+    :param m1: successes of the first variations
+    :param n1: totals of the first variations
+    :param m2: successes of the second variations
+    :param n2: totals of the second variations
+    :return: test statistics and p-values
+    """
+    m1, n1, m2, n2 = (np.asarray(x, dtype=np.float64) for x in (m1, n1, m2, n2))
+    if NUMBA_AVAILABLE:
+        m1, n1, m2, n2 = np.broadcast_arrays(m1, n1, m2, n2)
+        z, p_value = _z_binom_batch(m1.ravel(), n1.ravel(), m2.ravel(), n2.ravel())
+        return z.reshape(m1.shape), p_value.reshape(m1.shape)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pe = m1 / n1 - m2 / n2 + 0.5 * (1 / n1 - 1 / n2)  # point estimation
+        p = (m1 + m2) / (n1 + n2)  # pooled conversion
+        var = p * (1 - p) * (1 / n1 + 1 / n2)  # variance estimation
+        z = pe / np.sqrt(var)  # test statistic
+    p_value = ndtr(-z)  # p-value
+
+    return z, p_value
+
+
+def f_binomial_test_vec(m1: Ndarray, n1: Ndarray, m2: Ndarray, n2: Ndarray) -> Tuple[Ndarray, Ndarray]:
+    """
+    Vectorized version of f_binomial_test.
+    Performs a batch of tests at once on arrays of successes and totals (NumPy broadcasting rules apply).
+    Returns arrays of test statistics (odds ratios) and p-values.
+    
+    :param m1: successes of the first variations
+    :param n1: totals of the first variations
+    :param m2: successes of the second variations
+    :param n2: totals of the second variations
+    :return: test statistics and p-values
+    """
+    return _fisher_core(m1, n1, m2, n2)
+
+
+def simulate_fpr(n1: int, n2: int, p: float, n_sims: int,
+                 rng: Optional[np.random.Generator] = None) -> Ndarray:
+    """
+    Simulate A/A tests to study false positive rate of z_binomial_test.
+    Both variations are drawn from the same Binomial distribution, all tests are performed in one vectorized pass.
+    Returns p-values of simulated tests.
+    
+    :param n1: total number of the first variation
+    :param n2: total number of the second variation
+    :param p: true conversion of both variations
+    :param n_sims: number of simulations
+    :param rng: random generator. By default a new one is created.
+    :return: p-values
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    m1 = rng.binomial(n1, p, n_sims)
+    m2 = rng.binomial(n2, p, n_sims)
+    _, p_value = z_binomial_test_vec(m1, n1, m2, n2)
+    return p_value
 
 
 def posterior_beta_parameters(variation: Variation, prior: Tuple[float, float] = (1, 1)) -> Tuple[float, float]:
@@ -126,11 +196,6 @@ def prob_gt_beta(par1: Tuple[float, float], par2: Tuple[float, float], delta: fl
     :param delta: margin. Should be greater or equal to 0.
     :return: probability of p2 > p1 + delta
     """
-    from scipy.special import betaln
-    from scipy.stats import beta
-    from scipy.integrate import dblquad
-    from numpy import log, exp
-
     if delta > 0:
         # Chris Stucchio, Bayesian A/B Testing at VWO
         def joint_density(y: float, x: float) -> float:
@@ -146,11 +211,11 @@ def prob_gt_beta(par1: Tuple[float, float], par2: Tuple[float, float], delta: fl
         if False and (n > 10**4) and (psi < phi <= 0.01):
             # Chris Stucchio, Asymptotics of Evan Miller's Bayesian A/B formula
             # TODO: This block should be revisited as its results are inadequate
-            prob = log(2 / n / (phi - psi))
+            prob = math.log(2 / n / (phi - psi))
             prob += betaln(2 + n * (phi + psi), 2 + n * (2 - phi - psi))
             prob -= betaln(n * phi + 1, n * (1 - phi) + 1)
             prob -= betaln(n * psi + 1, n * (1 - psi) + 1)
-            prob = exp(prob)
+            prob = math.exp(prob)
             return prob
         else:
             # Evan Miller, Formulas for Bayesian A/B Testing
@@ -158,8 +223,8 @@ def prob_gt_beta(par1: Tuple[float, float], par2: Tuple[float, float], delta: fl
             a1, b1 = par1
             a2, b2 = par2
             for i in range(int(a2)):
-                term = betaln(a1 + i, b1 + b2) - betaln(1 + i, b2) - betaln(a1, b1) - log(b2 + i)
-                prob += exp(term)
+                term = betaln(a1 + i, b1 + b2) - betaln(1 + i, b2) - betaln(a1, b1) - math.log(b2 + i)
+                prob += math.exp(term)
             return prob
     else:
         raise Exception('delta >= 0 only.')
@@ -169,16 +234,21 @@ if __name__ == '__main__':
     import ABTypes
 
     var1 = list(map(int, input('Введите total и success первой вариации: ').split()))
-    var1 = ABTypes.Variation(*var1)
+    var1 = ABTypes.Variation.from_counts(*var1)
 
     var2 = list(map(int, input('Введите total и success второй вариации: ').split()))
-    var2 = ABTypes.Variation(*var2)
+    var2 = ABTypes.Variation.from_counts(*var2)
+
+    # both directions (var1 vs var2 and var2 vs var1) are tested in a single vectorized call
+    m1 = np.array([var1.success, var2.success])
+    n1 = np.array([var1.total, var2.total])
+    m2, n2 = m1[::-1], n1[::-1]
 
-    tests = [z_binomial_superiority_test, z_binomial_test, f_binomial_test]
+    tests = [z_binomial_superiority_test_vec, z_binomial_test_vec, f_binomial_test_vec]
     for test in tests:
         print(test)
-        print(test(var1, var2))
-        print(test(var2, var1))
+        for result in zip(*test(m1, n1, m2, n2)):
+            print(result)
         print('-' * 80)
 
     beta1 = posterior_beta_parameters(var1)
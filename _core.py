@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Numeric kernels of the tests provided in ABUtils.
+Kernels operate on plain numbers and arrays, unpacking of Variation objects is left to ABUtils.
+"""
+from ABTypes import Ndarray
+import numpy as np
+from typing import Tuple
+from scipy.stats import hypergeom
+import math
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional, kernels fall back to plain Python
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op replacement for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, error_model='numpy')
+def _z_statistic(pe: float, var: float) -> Tuple[float, float]:
+    """Test statistic and upper tail p-value of the standard normal distribution."""
+    if var > 0:
+        z = pe / math.sqrt(var)
+    elif var == 0 and (pe > 0 or pe < 0):
+        z = math.copysign(math.inf, pe)
+    else:
+        z = math.nan
+    return z, 0.5 * math.erfc(z / math.sqrt(2.0))
+
+
+@njit(cache=True, error_model='numpy')
+def _z_superiority_core(s1: float, n1: float, s2: float, n2: float, delta: float) -> Tuple[float, float]:
+    """Numeric kernel of z_binomial_superiority_test."""
+    if n1 == 0 or n2 == 0:
+        return math.nan, math.nan
+    p1_hat = s1 / n1
+    p2_hat = s2 / n2
+    pe = p1_hat - p2_hat - delta  # point estimation
+    var = p1_hat * (1 - p1_hat) / n1 + p2_hat * (1 - p2_hat) / n2  # variance estimation
+    return _z_statistic(pe, var)
+
+
+@njit(cache=True, error_model='numpy')
+def _z_binom_core(m1: float, n1: float, m2: float, n2: float) -> Tuple[float, float]:
+    """Numeric kernel of z_binomial_test."""
+    if n1 == 0 or n2 == 0:
+        return math.nan, math.nan
+    pe = m1 / n1 - m2 / n2 + 0.5 * (1 / n1 - 1 / n2)  # point estimation
+    var = ((m1 + m2) / (n1 + n2) *
+           (n1 + n2 - m1 - m2) / (n1 + n2) *
+           (1 / n1 + 1 / n2)
+           )  # variance estimation
+    return _z_statistic(pe, var)
+
+
+@njit(cache=True, error_model='numpy', parallel=True)
+def _z_superiority_batch(s1: Ndarray, n1: Ndarray, s2: Ndarray, n2: Ndarray,
+                         delta: float) -> Tuple[Ndarray, Ndarray]:
+    """Parallel batch of _z_superiority_core over 1-D float arrays. Used only if numba is available."""
+    z = np.empty(s1.size)
+    p_value = np.empty(s1.size)
+    for i in prange(s1.size):
+        z[i], p_value[i] = _z_superiority_core(s1[i], n1[i], s2[i], n2[i], delta)
+    return z, p_value
+
+
+@njit(cache=True, error_model='numpy', parallel=True)
+def _z_binom_batch(m1: Ndarray, n1: Ndarray, m2: Ndarray, n2: Ndarray) -> Tuple[Ndarray, Ndarray]:
+    """Parallel batch of _z_binom_core over 1-D float arrays. Used only if numba is available."""
+    z = np.empty(m1.size)
+    p_value = np.empty(m1.size)
+    for i in prange(m1.size):
+        z[i], p_value[i] = _z_binom_core(m1[i], n1[i], m2[i], n2[i])
+    return z, p_value
+
+
+def _fisher_scalar_core(s1: int, n1: int, s2: int, n2: int) -> Tuple[float, float]:
+    """Numeric kernel of f_binomial_test for a single 2x2 table. Same results as _fisher_core."""
+    if not n1 or not n2 or not s1 + s2 or s1 + s2 == n1 + n2:
+        return math.nan, 1.  # zero row or column of the table, as in fisher_exact
+    den = s2 * (n1 - s1)
+    oddsratio = s1 * (n2 - s2) / den if den else math.inf  # sample odds ratio
+    p_value = float(hypergeom.sf(s1 - 1, n1 + n2, s1 + s2, n1))  # p-value
+    return oddsratio, p_value
+
+
+def _fisher_core(s1: Ndarray, n1: Ndarray, s2: Ndarray, n2: Ndarray) -> Tuple[Ndarray, Ndarray]:
+    """Numeric kernel of f_binomial_test. Accepts numbers or arrays (NumPy broadcasting rules apply)."""
+    s1, n1, s2, n2 = (np.asarray(x, dtype=np.int64) for x in (s1, n1, s2, n2))
+    num = s1 * (n2 - s2)
+    den = s2 * (n1 - s1)
+    # as in fisher_exact: a zero row or column of the 2x2 table gives nan and 1, a zero denominator gives inf
+    degenerate = (n1 == 0) | (n2 == 0) | (s1 + s2 == 0) | (s1 + s2 == n1 + n2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        oddsratio = np.where(den > 0, num / den, np.inf)  # sample odds ratio
+    oddsratio = np.where(degenerate, np.nan, oddsratio)
+    p_value = np.where(degenerate, 1., hypergeom.sf(s1 - 1, n1 + n2, s1 + s2, n1))  # p-value
+    return oddsratio, p_value